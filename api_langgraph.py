@@ -29,8 +29,11 @@ try:
         logger.warning("OPEN_AI_API_KEY not found in .env file. Using environment variable instead.")
         api_key = os.environ.get('OPENAI_API_KEY')
     
+    # LLM_SINGLE_PROMPT=1 evaluates each order with one consolidated LLM call
+    single_prompt = os.getenv('LLM_SINGLE_PROMPT', '').lower() in ('1', 'true', 'yes')
+    
     inventory_manager = InventoryManager('data/inventory.json', 'data/materials.json')
-    manager = LLMManagerAgent(api_key, inventory_manager)
+    manager = LLMManagerAgent(api_key, inventory_manager, single_prompt=single_prompt)
     logger.info("✅ LangGraph Manager Agent initialized successfully")
 except Exception as e:
     logger.error(f"❌ Failed to initialize LangGraph Manager: {str(e)}")
@@ -177,9 +180,12 @@ def get_product_details(sku):
         materials_info = []
         total_material_cost = 0
         
+        get_material_record = inventory_manager.get_material_record
         for material_id, qty_per_unit in bom['materials'].items():
-            unit_cost = inventory_manager.get_material_price(material_id)
-            available_stock = inventory_manager.get_material_stock(material_id)
+            # One lookup per BOM line for both price and stock
+            record = get_material_record(material_id)
+            unit_cost = record['unit_cost'] if record else None
+            available_stock = record['stock'] if record else None
             
             material_info = {
                 'material_id': material_id,
@@ -4,32 +4,170 @@ Uses LLM (OpenAI) for intelligent agent decision-making
 """
 
 import os
+import atexit
 import json
+import time
+import asyncio
+import bisect
+import hashlib
+import importlib.util
 import logging
-from typing import Any, Dict, Optional, List
+import threading
+import orjson
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, Dict, Optional, List
 from datetime import datetime, timedelta
 from dataclasses import dataclass
 from enum import Enum
-from dotenv import load_dotenv
 
-# Load environment variables
-load_dotenv()
-
-# Import LangChain and LangGraph
-from langchain_openai import ChatOpenAI
-from langchain_core.prompts import ChatPromptTemplate
-from langchain_core.messages import BaseMessage, HumanMessage, AIMessage
-from langgraph.graph import StateGraph, END
+# Import LangChain; the heavier langchain_openai and langgraph packages are
+# imported where they are first needed to keep module import cheap
+from langchain_core.messages import BaseMessage, SystemMessage, HumanMessage, AIMessage
 # from langgraph.graph import CompiledGraph
 from typing import TypedDict, Annotated
 import operator
 
+if TYPE_CHECKING:
+    from langchain_openai import ChatOpenAI
+
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
+_LOG_RULE = '=' * 60
+
+# Decodes a JSON object embedded in an LLM response without regex backtracking
+_JSON_DECODER = json.JSONDecoder()
+
+# Seconds before a single OpenAI request is abandoned
+_LLM_REQUEST_TIMEOUT = 30.0
+
+# Quantity discount tiers: a quantity at or above _DISCOUNT_THRESHOLDS[i]
+# earns _DISCOUNT_RATES[i + 1]
+_DISCOUNT_THRESHOLDS = [11, 51, 100]
+_DISCOUNT_RATES = [0.0, 0.05, 0.10, 0.15]
+
+# Fallback pricing used when the Consolidation Agent's reply has no numbers
+_FALLBACK_BASE_COST = 100000.0  # Default estimate
+_PROFIT_MULTIPLIER = 1.25  # 25% profit margin
+
+# HTTP/2 needs the optional h2 package (httpx[http2])
+_HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+
+def _extract_json(text: str) -> Optional[Dict]:
+    """Extract the JSON object from an LLM response, or None if there isn't one"""
+    # Fast path: the model usually answers with a bare JSON object
+    try:
+        data = json.loads(text)
+    except ValueError:
+        data = None
+    if isinstance(data, dict):
+        return data
+    
+    # Otherwise decode the object embedded in the surrounding prose. Only the
+    # first '{' is tried: a later one may sit inside a truncated outer object,
+    # and a nested fragment must not be mistaken for the whole analysis
+    start = text.find('{')
+    if start == -1:
+        return None
+    try:
+        data, _ = _JSON_DECODER.raw_decode(text, start)
+    except ValueError:
+        return None
+    return data if isinstance(data, dict) else None
+
+
+class ResponseCache:
+    """In-process TTL cache of LLM responses keyed by a SHA256 of the rendered prompt"""
+    
+    def __init__(self, ttl_seconds: float = 3600, max_entries: int = 1024):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def make_key(messages: List[BaseMessage]) -> str:
+        """Hash the role and content of every message in the prompt"""
+        digest = hashlib.sha256()
+        for message in messages:
+            digest.update(message.type.encode())
+            digest.update(b'\0')
+            digest.update(str(message.content).encode())
+            digest.update(b'\0')
+        return digest.hexdigest()
+    
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached response text, or None if missing or expired"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, text = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return text
+    
+    def set(self, key: str, text: str) -> None:
+        """Store a response, evicting the least recently used entry when full"""
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, text)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+class _ChatPrompt:
+    """Fixed (role, template) chat prompt rendered with str.format_map"""
+    
+    _MESSAGE_TYPES = {"system": SystemMessage, "human": HumanMessage}
+    
+    def __init__(self, messages: List[tuple]):
+        # Resolve message classes and bind the format functions once, instead
+        # of re-parsing the templates on every call
+        self._renderers = [
+            (self._MESSAGE_TYPES[role], template.format_map)
+            for role, template in messages
+        ]
+    
+    def format_messages(self, **kwargs) -> List[BaseMessage]:
+        """Render the prompt into chat messages"""
+        return [message_type(content=render(kwargs)) for message_type, render in self._renderers]
+
+
+def _discount_rate(quantity: int) -> float:
+    """Look up the quantity discount rate for an order"""
+    return _DISCOUNT_RATES[bisect.bisect_right(_DISCOUNT_THRESHOLDS, quantity)]
+
 
+def _fallback_price(quantity: int, shipping: float, base_cost: float = _FALLBACK_BASE_COST) -> tuple:
+    """Estimate (discount_rate, final_price) when the LLM gives no pricing"""
+    discount_rate = _discount_rate(quantity)
+    return discount_rate, (base_cost + shipping) * (1.0 - discount_rate) * _PROFIT_MULTIPLIER
 
-@dataclass
+
+async def _ainvoke_llm(llm: "ChatOpenAI", messages: List[BaseMessage], cache: Optional[ResponseCache] = None) -> str:
+    """Invoke the LLM asynchronously, serving identical prompts from the response cache"""
+    if cache is None:
+        return (await llm.ainvoke(messages)).content
+    
+    key = ResponseCache.make_key(messages)
+    cached = cache.get(key)
+    if cached is not None:
+        logger.info("LLM response cache hit")
+        return cached
+    
+    response_text = (await llm.ainvoke(messages)).content
+    # Only cache replies that parse; a truncated or garbled completion
+    # would otherwise be replayed to every identical order until it expires
+    if _extract_json(response_text) is not None:
+        cache.set(key, response_text)
+    return response_text
+
+
+@dataclass(slots=True, frozen=True)
 class OrderRequest:
     """Represents an incoming order request"""
     order_id: str
@@ -37,6 +175,16 @@ class OrderRequest:
     quantity: int
     customer_location: str
     priority: str = "normal"
+    
+    def to_dict(self) -> Dict:
+        """Build the order dict carried in the LangGraph state"""
+        return {
+            'order_id': self.order_id,
+            'product_sku': self.product_sku,
+            'quantity': self.quantity,
+            'customer_location': self.customer_location,
+            'priority': self.priority
+        }
 
 
 class LLMAgentState(TypedDict):
@@ -44,12 +192,13 @@ class LLMAgentState(TypedDict):
     order: dict
     inventory: list
     materials: list
-    procurement_analysis: Optional[str]
-    logistics_analysis: Optional[str]
-    consolidation_analysis: Optional[str]
+    procurement_analysis: Optional[Dict]
+    logistics_analysis: Optional[Dict]
+    consolidation_analysis: Optional[Dict]
     messages: Annotated[List[BaseMessage], operator.add]
     all_can_proceed: bool
     final_decision: Optional[str]
+    now: datetime
 
 
 class InventoryManager:
@@ -58,50 +207,62 @@ class InventoryManager:
     def __init__(self, inventory_file: str, materials_file: str):
         self.inventory = self._load_json(inventory_file)
         self.materials = self._load_json(materials_file)
+        
+        # Index both catalogs once so lookups are O(1) instead of list scans
+        self._inventory_by_id = {item['material_id']: item for item in self.inventory}
+        self._materials_by_sku = {item['sku']: item for item in self.materials}
     
     def _load_json(self, filepath: str) -> List:
-        with open(filepath, 'r') as f:
-            return json.load(f)
+        with open(filepath, 'rb') as f:
+            return orjson.loads(f.read())
     
     def get_inventory_dict(self) -> Dict:
-        """Convert inventory list to dictionary"""
-        return {item['material_id']: item for item in self.inventory}
+        """Get inventory indexed by material_id"""
+        return self._inventory_by_id
     
     def get_materials_dict(self) -> Dict:
-        """Convert materials list to dictionary"""
-        return {item['sku']: item for item in self.materials}
+        """Get product BOMs indexed by sku"""
+        return self._materials_by_sku
     
     def get_product_bom(self, sku: str) -> Optional[Dict]:
         """Get Bill of Materials for a product"""
-        for material in self.materials:
-            if material['sku'] == sku:
-                return material
-        return None
+        return self._materials_by_sku.get(sku)
+    
+    def get_material_record(self, material_id: str) -> Optional[Dict]:
+        """Get the full inventory record of a material"""
+        return self._inventory_by_id.get(material_id)
     
     def get_material_price(self, material_id: str) -> Optional[float]:
         """Get unit cost of a material"""
-        for item in self.inventory:
-            if item['material_id'] == material_id:
-                return item['unit_cost']
-        return None
+        item = self._inventory_by_id.get(material_id)
+        return item['unit_cost'] if item else None
     
     def get_material_stock(self, material_id: str) -> Optional[int]:
         """Get available stock of a material"""
-        for item in self.inventory:
-            if item['material_id'] == material_id:
-                return item['stock']
-        return None
+        item = self._inventory_by_id.get(material_id)
+        return item['stock'] if item else None
 
 
 class LLMProcurementAgent:
     """Agent 1: LLM-based Procurement Agent"""
     
-    def __init__(self, llm: ChatOpenAI, inventory_manager: InventoryManager):
+    def __init__(self, llm: "ChatOpenAI", inventory_manager: InventoryManager,
+                 cache: Optional[ResponseCache] = None):
         self.llm = llm
         self.inventory_manager = inventory_manager
+        self.cache = cache
         self.name = "Procurement Agent"
         
-        self.prompt = ChatPromptTemplate.from_template("""
+        # Serialize the full catalog once, for unknown SKUs; the slice for
+        # each ordered SKU is serialized on first use and memoized
+        self._inventory_str = self._dump_catalog(inventory_manager.inventory)
+        self._materials_str = self._dump_catalog(inventory_manager.materials)
+        self._catalog_by_sku: Dict[str, tuple] = {}
+        
+        # The system message holds the instructions and the ordered SKU's
+        # catalog slice; the human message holds the order details
+        self.prompt = _ChatPrompt([
+            ("system", """
 You are a Procurement Agent responsible for checking material availability and calculating costs.
 
 Current Inventory Data:
@@ -110,27 +271,32 @@ Current Inventory Data:
 Product BOM Data:
 {materials}
 
-Task: Analyze the following order request and provide:
+Task: Analyze the order request and provide:
 1. Whether all materials are available
 2. Total material cost
 3. Any concerns or notes
 4. Your confidence level (0.0-1.0)
 
+Provide your analysis in JSON format with keys: can_proceed, reasoning, material_availability, total_cost, confidence
+"""),
+            ("human", """
 Order Request:
 - Product SKU: {product_sku}
 - Quantity: {quantity}
-
-Provide your analysis in JSON format with keys: can_proceed, reasoning, material_availability, total_cost, confidence
 """)
+        ])
     
-    def invoke(self, order: dict, inventory: list, materials: list) -> Dict:
+    async def ainvoke(self, order: dict, inventory: list, materials: list) -> Dict:
         """Analyze procurement for the order"""
-        logger.info(f"[{self.name}] Analyzing availability for {order['product_sku']} x{order['quantity']}")
+        logger.info("[%s] Analyzing availability for %s x%s", self.name, order['product_sku'], order['quantity'])
         
-        inventory_str = json.dumps(inventory, indent=2)
-        materials_str = json.dumps(materials, indent=2)
+        if inventory is self.inventory_manager.inventory and materials is self.inventory_manager.materials:
+            inventory_str, materials_str = self.catalog_for(order['product_sku'])
+        else:
+            inventory_str = self._dump_catalog(inventory)
+            materials_str = self._dump_catalog(materials)
         
-        prompt_value = self.prompt.format(
+        messages = self.prompt.format_messages(
             inventory=inventory_str,
             materials=materials_str,
             product_sku=order['product_sku'],
@@ -138,81 +304,111 @@ Provide your analysis in JSON format with keys: can_proceed, reasoning, material
         )
         
         try:
-            response = self.llm.invoke([HumanMessage(content=prompt_value)])
-            
             # Parse the response
-            response_text = response.content
-            logger.info(f"[{self.name}] Analysis: {response_text[:200]}...")
+            response_text = await _ainvoke_llm(self.llm, messages, self.cache)
+            logger.debug("[%s] Analysis: %.200s...", self.name, response_text)
             
             # Try to extract JSON from response
-            try:
-                import re
-                json_match = re.search(r'\{.*\}', response_text, re.DOTALL)
-                if json_match:
-                    analysis = json.loads(json_match.group())
-                else:
-                    analysis = self._parse_analysis(response_text)
-            except:
-                analysis = self._parse_analysis(response_text)
+            analysis = _extract_json(response_text)
+            if analysis is None:
+                analysis = self.parse_analysis(response_text)
             
-            return {
-                'agent': self.name,
-                'can_proceed': analysis.get('can_proceed', False),
-                'reasoning': analysis.get('reasoning', response_text),
-                'analysis': response_text,
-                'confidence': float(analysis.get('confidence', 0.7))
-            }
+            return self.build_result(analysis, response_text)
         except Exception as e:
-            logger.error(f"[{self.name}] Error: {str(e)}")
-            return {
-                'agent': self.name,
-                'can_proceed': False,
-                'reasoning': f"Error in analysis: {str(e)}",
-                'analysis': str(e),
-                'confidence': 0.0
-            }
+            logger.error("[%s] Error: %s", self.name, e)
+            return self.error_result(e)
     
-    def _parse_analysis(self, text: str) -> Dict:
+    def build_result(self, analysis: Dict, response_text: str) -> Dict:
+        """Build the agent result from a parsed analysis"""
+        return {
+            'agent': self.name,
+            'can_proceed': analysis.get('can_proceed', False),
+            'reasoning': analysis.get('reasoning', response_text),
+            'analysis': response_text,
+            'confidence': float(analysis.get('confidence', 0.7))
+        }
+    
+    def error_result(self, error: Exception) -> Dict:
+        """Build the agent result for a failed analysis"""
+        return {
+            'agent': self.name,
+            'can_proceed': False,
+            'reasoning': f"Error in analysis: {str(error)}",
+            'analysis': str(error),
+            'confidence': 0.0
+        }
+    
+    def catalog_for(self, sku: str) -> tuple:
+        """Get the serialized inventory and BOM data relevant to one product"""
+        catalog = self._catalog_by_sku.get(sku)
+        if catalog is None:
+            bom = self.inventory_manager.get_product_bom(sku)
+            if bom is None:
+                # Unknown SKU: show the full catalog so the agent can report it
+                return self._inventory_str, self._materials_str
+            
+            inventory_by_id = self.inventory_manager.get_inventory_dict()
+            relevant_inventory = [
+                inventory_by_id[material_id]
+                for material_id in bom['materials']
+                if material_id in inventory_by_id
+            ]
+            catalog = (self._dump_catalog(relevant_inventory), self._dump_catalog([bom]))
+            self._catalog_by_sku[sku] = catalog
+        return catalog
+    
+    @staticmethod
+    def _dump_catalog(data: list) -> str:
+        """Serialize catalog data for the prompt"""
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2).decode()
+    
+    def parse_analysis(self, text: str) -> Dict:
         """Parse analysis from LLM response"""
+        lowered = text.lower()
+        available = 'available' in lowered
         return {
-            'can_proceed': 'available' in text.lower() or 'proceed' in text.lower(),
+            'can_proceed': available or 'proceed' in lowered,
             'reasoning': text,
-            'confidence': 0.85 if 'available' in text.lower() else 0.5
+            'confidence': 0.85 if available else 0.5
         }
 
 
 class LLMLogisticsAgent:
     """Agent 2: LLM-based Logistics Agent"""
     
-    def __init__(self, llm: ChatOpenAI):
+    def __init__(self, llm: "ChatOpenAI", cache: Optional[ResponseCache] = None):
         self.llm = llm
+        self.cache = cache
         self.name = "Logistics Agent"
         
-        self.prompt = ChatPromptTemplate.from_template("""
+        self.prompt = _ChatPrompt([
+            ("system", """
 You are a Logistics Agent responsible for calculating shipping costs and delivery timelines.
 
-Task: Analyze the following order request and provide:
+Task: Analyze the order request and provide:
 1. Location type classification (local/regional/national/international)
 2. Estimated shipping cost
 3. Estimated delivery date
 4. Any logistical concerns
 5. Your confidence level (0.0-1.0)
 
+Provide your analysis in JSON format with keys: location_type, shipping_cost, delivery_date, reasoning, confidence
+"""),
+            ("human", """
 Order Details:
 - Product SKU: {product_sku}
 - Quantity: {quantity}
 - Customer Location: {customer_location}
 - Priority: {priority}
 - Material Cost: {material_cost}
-
-Provide your analysis in JSON format with keys: location_type, shipping_cost, delivery_date, reasoning, confidence
 """)
+        ])
     
-    def invoke(self, order: dict, material_cost: float) -> Dict:
+    async def ainvoke(self, order: dict, material_cost: float, now: Optional[datetime] = None) -> Dict:
         """Analyze logistics for the order"""
-        logger.info(f"[{self.name}] Calculating logistics for {order['customer_location']}")
+        logger.info("[%s] Calculating logistics for %s", self.name, order['customer_location'])
         
-        prompt_value = self.prompt.format(
+        messages = self.prompt.format_messages(
             product_sku=order['product_sku'],
             quantity=order['quantity'],
             customer_location=order['customer_location'],
@@ -221,68 +417,74 @@ Provide your analysis in JSON format with keys: location_type, shipping_cost, de
         )
         
         try:
-            response = self.llm.invoke([HumanMessage(content=prompt_value)])
+            response_text = await _ainvoke_llm(self.llm, messages, self.cache)
+            logger.debug("[%s] Analysis: %.200s...", self.name, response_text)
             
-            response_text = response.content
-            logger.info(f"[{self.name}] Analysis: {response_text[:200]}...")
+            analysis = _extract_json(response_text)
+            if analysis is None:
+                analysis = self.parse_analysis(response_text, now)
             
-            try:
-                import re
-                json_match = re.search(r'\{.*\}', response_text, re.DOTALL)
-                if json_match:
-                    analysis = json.loads(json_match.group())
-                else:
-                    analysis = self._parse_analysis(response_text)
-            except:
-                analysis = self._parse_analysis(response_text)
-            
-            return {
-                'agent': self.name,
-                'can_proceed': True,
-                'location_type': analysis.get('location_type', 'unknown'),
-                'shipping_cost': float(analysis.get('shipping_cost', 50)),
-                'delivery_date': analysis.get('delivery_date', self._default_delivery_date(order.get('priority'))),
-                'reasoning': analysis.get('reasoning', response_text),
-                'analysis': response_text,
-                'confidence': float(analysis.get('confidence', 0.8))
-            }
+            return self.build_result(analysis, response_text, order, now)
         except Exception as e:
-            logger.error(f"[{self.name}] Error: {str(e)}")
-            return {
-                'agent': self.name,
-                'can_proceed': True,
-                'location_type': 'unknown',
-                'shipping_cost': 50.0,
-                'delivery_date': self._default_delivery_date(order.get('priority')),
-                'reasoning': f"Error in analysis: {str(e)}",
-                'analysis': str(e),
-                'confidence': 0.5
-            }
+            logger.error("[%s] Error: %s", self.name, e)
+            return self.error_result(e, order, now)
+    
+    def build_result(self, analysis: Dict, response_text: str, order: dict, now: Optional[datetime] = None) -> Dict:
+        """Build the agent result from a parsed analysis"""
+        delivery_date = analysis.get('delivery_date')
+        if delivery_date is None:
+            delivery_date = self._default_delivery_date(order.get('priority'), now)
+        
+        return {
+            'agent': self.name,
+            'can_proceed': True,
+            'location_type': analysis.get('location_type', 'unknown'),
+            'shipping_cost': float(analysis.get('shipping_cost', 50)),
+            'delivery_date': delivery_date,
+            'reasoning': analysis.get('reasoning', response_text),
+            'analysis': response_text,
+            'confidence': float(analysis.get('confidence', 0.8))
+        }
     
-    def _parse_analysis(self, text: str) -> Dict:
+    def error_result(self, error: Exception, order: dict, now: Optional[datetime] = None) -> Dict:
+        """Build the agent result for a failed analysis"""
+        return {
+            'agent': self.name,
+            'can_proceed': True,
+            'location_type': 'unknown',
+            'shipping_cost': 50.0,
+            'delivery_date': self._default_delivery_date(order.get('priority'), now),
+            'reasoning': f"Error in analysis: {str(error)}",
+            'analysis': str(error),
+            'confidence': 0.5
+        }
+    
+    def parse_analysis(self, text: str, now: Optional[datetime] = None) -> Dict:
         """Parse analysis from LLM response"""
         return {
             'location_type': 'regional' if 'region' in text.lower() else 'local',
             'shipping_cost': 50.0,
-            'delivery_date': (datetime.now() + timedelta(days=5)).strftime("%Y-%m-%d"),
+            'delivery_date': self._default_delivery_date("normal", now),
             'reasoning': text,
             'confidence': 0.8
         }
     
-    def _default_delivery_date(self, priority: str = "normal") -> str:
+    def _default_delivery_date(self, priority: str = "normal", now: Optional[datetime] = None) -> str:
         """Get default delivery date"""
         days = 2 if priority == "expedited" else 5
-        return (datetime.now() + timedelta(days=days)).strftime("%Y-%m-%d")
+        return ((now or datetime.now()) + timedelta(days=days)).date().isoformat()
 
 
 class LLMConsolidationAgent:
     """Agent 3: LLM-based Consolidation Agent"""
     
-    def __init__(self, llm: ChatOpenAI):
+    def __init__(self, llm: "ChatOpenAI", cache: Optional[ResponseCache] = None):
         self.llm = llm
+        self.cache = cache
         self.name = "Consolidation Agent"
         
-        self.prompt = ChatPromptTemplate.from_template("""
+        self.prompt = _ChatPrompt([
+            ("system", """
 You are a Consolidation Agent responsible for finalizing pricing and deal structure.
 
 Task: Review the procurement and logistics data, then provide:
@@ -293,6 +495,16 @@ Task: Review the procurement and logistics data, then provide:
 5. Any recommendations
 6. Your confidence level (0.0-1.0)
 
+Profit Margin: 25%
+Discount Tiers:
+- 1-10 units: 0%
+- 11-50 units: 5%
+- 51-100 units: 10%
+- 100+ units: 15%
+
+Provide your analysis in JSON format with keys: can_proceed, discount_rate, final_price, total_deal_value, reasoning, confidence
+"""),
+            ("human", """
 Procurement Analysis:
 - Can Proceed: {procurement_can_proceed}
 - Material Cost: {material_cost}
@@ -307,24 +519,16 @@ Logistics Analysis:
 Order Details:
 - Quantity: {quantity}
 - Product: {product_sku}
-
-Profit Margin: 25%
-Discount Tiers:
-- 1-10 units: 0%
-- 11-50 units: 5%
-- 51-100 units: 10%
-- 100+ units: 15%
-
-Provide your analysis in JSON format with keys: can_proceed, discount_rate, final_price, total_deal_value, reasoning, confidence
 """)
+        ])
     
-    def invoke(self, procurement_result: Dict, logistics_result: Dict, order: dict) -> Dict:
+    async def ainvoke(self, procurement_result: Dict, logistics_result: Dict, order: dict) -> Dict:
         """Consolidate and finalize the deal"""
-        logger.info(f"[{self.name}] Consolidating deal structure")
+        logger.info("[%s] Consolidating deal structure", self.name)
         
         material_cost = procurement_result.get('analysis', 'Unknown')
         
-        prompt_value = self.prompt.format(
+        messages = self.prompt.format_messages(
             procurement_can_proceed=procurement_result['can_proceed'],
             material_cost=material_cost,
             procurement_reasoning=procurement_result.get('reasoning', 'N/A'),
@@ -337,61 +541,61 @@ Provide your analysis in JSON format with keys: can_proceed, discount_rate, fina
         )
         
         try:
-            response = self.llm.invoke([HumanMessage(content=prompt_value)])
-            
-            response_text = response.content
-            logger.info(f"[{self.name}] Analysis: {response_text[:200]}...")
+            response_text = await _ainvoke_llm(self.llm, messages, self.cache)
+            logger.debug("[%s] Analysis: %.200s...", self.name, response_text)
             
-            try:
-                import re
-                json_match = re.search(r'\{.*\}', response_text, re.DOTALL)
-                if json_match:
-                    analysis = json.loads(json_match.group())
-                else:
-                    analysis = self._parse_analysis(response_text, procurement_result, logistics_result, order)
-            except:
-                analysis = self._parse_analysis(response_text, procurement_result, logistics_result, order)
+            analysis = _extract_json(response_text)
+            if analysis is None:
+                analysis = self.parse_analysis(response_text, procurement_result, logistics_result, order)
             
-            return {
-                'agent': self.name,
-                'can_proceed': analysis.get('can_proceed', False),
-                'discount_rate': float(analysis.get('discount_rate', 0)),
-                'final_price': float(analysis.get('final_price', 0)),
-                'total_deal_value': float(analysis.get('total_deal_value', 0)),
-                'reasoning': analysis.get('reasoning', response_text),
-                'analysis': response_text,
-                'confidence': float(analysis.get('confidence', 0.8))
-            }
+            return self.build_result(analysis, response_text)
         except Exception as e:
-            logger.error(f"[{self.name}] Error: {str(e)}")
-            return {
-                'agent': self.name,
-                'can_proceed': False,
-                'discount_rate': 0,
-                'final_price': 0,
-                'total_deal_value': 0,
-                'reasoning': f"Error in analysis: {str(e)}",
-                'analysis': str(e),
-                'confidence': 0.0
-            }
+            logger.error("[%s] Error: %s", self.name, e)
+            return self.error_result(e)
+    
+    def build_result(self, analysis: Dict, response_text: str) -> Dict:
+        """Build the agent result from a parsed analysis"""
+        return {
+            'agent': self.name,
+            'can_proceed': analysis.get('can_proceed', False),
+            'discount_rate': float(analysis.get('discount_rate', 0)),
+            'final_price': float(analysis.get('final_price', 0)),
+            'total_deal_value': float(analysis.get('total_deal_value', 0)),
+            'reasoning': analysis.get('reasoning', response_text),
+            'analysis': response_text,
+            'confidence': float(analysis.get('confidence', 0.8))
+        }
+    
+    def error_result(self, error: Exception) -> Dict:
+        """Build the agent result for a failed analysis"""
+        return {
+            'agent': self.name,
+            'can_proceed': False,
+            'discount_rate': 0,
+            'final_price': 0,
+            'total_deal_value': 0,
+            'reasoning': f"Error in analysis: {str(error)}",
+            'analysis': str(error),
+            'confidence': 0.0
+        }
     
-    def _parse_analysis(self, text: str, procurement_result: Dict, logistics_result: Dict, order: dict) -> Dict:
+    def blocked_result(self, reason: str) -> Dict:
+        """Build the agent result for a deal an upstream agent already rejected"""
+        return {
+            'agent': self.name,
+            'can_proceed': False,
+            'discount_rate': 0,
+            'final_price': 0,
+            'total_deal_value': 0,
+            'reasoning': f"Skipped: {reason}",
+            'analysis': reason,
+            'confidence': 0.0
+        }
+    
+    def parse_analysis(self, text: str, procurement_result: Dict, logistics_result: Dict, order: dict) -> Dict:
         """Parse analysis from LLM response"""
         # Calculate default values
-        discount_rate = 0.0
-        if order['quantity'] >= 100:
-            discount_rate = 0.15
-        elif order['quantity'] >= 51:
-            discount_rate = 0.10
-        elif order['quantity'] >= 11:
-            discount_rate = 0.05
-        
-        base_cost = 100000  # Default estimate
-        shipping = logistics_result.get('shipping_cost', 50)
-        subtotal = base_cost + shipping
-        discount_amount = subtotal * discount_rate
-        after_discount = subtotal - discount_amount
-        final_price = after_discount * 1.25  # 25% profit margin
+        discount_rate, final_price = _fallback_price(order['quantity'], logistics_result.get('shipping_cost', 50))
         
         return {
             'can_proceed': procurement_result.get('can_proceed', False) and logistics_result.get('can_proceed', False),
@@ -403,104 +607,318 @@ Provide your analysis in JSON format with keys: can_proceed, discount_rate, fina
         }
 
 
+class LLMOrderDecisionAgent:
+    """LLM-based agent that produces all three agent analyses in a single call"""
+    
+    def __init__(self, llm: "ChatOpenAI", procurement_agent: LLMProcurementAgent,
+                 logistics_agent: LLMLogisticsAgent, consolidation_agent: LLMConsolidationAgent,
+                 cache: Optional[ResponseCache] = None):
+        self.llm = llm
+        self.procurement_agent = procurement_agent
+        self.logistics_agent = logistics_agent
+        self.consolidation_agent = consolidation_agent
+        self.cache = cache
+        self.name = "Order Decision Agent"
+        
+        self.prompt = _ChatPrompt([
+            ("system", """
+You are an Order Decision Agent doing the work of a Procurement, a Logistics and a Consolidation agent in a single review.
+
+Current Inventory Data:
+{inventory}
+
+Product BOM Data:
+{materials}
+
+Procurement: determine whether all materials are available, the total material cost, any concerns or notes, and your confidence level (0.0-1.0).
+
+Logistics: classify the location type (local/regional/national/international), estimate the shipping cost and delivery date, note any logistical concerns, and give your confidence level (0.0-1.0).
+
+Consolidation: using your procurement and logistics findings, decide whether the deal should proceed, the applicable discount (based on quantity), the final price, the total deal value, any recommendations, and your confidence level (0.0-1.0).
+
+Profit Margin: 25%
+Discount Tiers:
+- 1-10 units: 0%
+- 11-50 units: 5%
+- 51-100 units: 10%
+- 100+ units: 15%
+
+Provide your analysis in JSON format with keys: procurement, logistics, consolidation
+- procurement keys: can_proceed, reasoning, material_availability, total_cost, confidence
+- logistics keys: location_type, shipping_cost, delivery_date, reasoning, confidence
+- consolidation keys: can_proceed, discount_rate, final_price, total_deal_value, reasoning, confidence
+"""),
+            ("human", """
+Order Details:
+- Product SKU: {product_sku}
+- Quantity: {quantity}
+- Customer Location: {customer_location}
+- Priority: {priority}
+""")
+        ])
+    
+    async def ainvoke(self, order: dict, now: Optional[datetime] = None) -> Dict:
+        """Analyze the whole order, returning procurement, logistics and consolidation results"""
+        logger.info("[%s] Analyzing %s x%s to %s", self.name, order['product_sku'], order['quantity'], order['customer_location'])
+        
+        inventory_str, materials_str = self.procurement_agent.catalog_for(order['product_sku'])
+        messages = self.prompt.format_messages(
+            inventory=inventory_str,
+            materials=materials_str,
+            product_sku=order['product_sku'],
+            quantity=order['quantity'],
+            customer_location=order['customer_location'],
+            priority=order.get('priority', 'normal')
+        )
+        
+        try:
+            response_text = await _ainvoke_llm(self.llm, messages, self.cache)
+            logger.debug("[%s] Analysis: %.200s...", self.name, response_text)
+            
+            decision = _extract_json(response_text)
+            
+            # Split the decision back into per-agent results. Only a reply
+            # that is not JSON at all falls back to the agents' text
+            # heuristics; a missing or malformed section of a parsed reply
+            # is treated as an empty analysis, so that agent does not proceed
+            if decision is None:
+                procurement = self.procurement_agent.parse_analysis(response_text)
+                logistics = self.logistics_agent.parse_analysis(response_text, now)
+            else:
+                procurement = self._section(decision, 'procurement')
+                logistics = self._section(decision, 'logistics')
+            procurement_result = self.procurement_agent.build_result(procurement, response_text)
+            logistics_result = self.logistics_agent.build_result(logistics, response_text, order, now)
+            
+            if decision is None:
+                consolidation = self.consolidation_agent.parse_analysis(
+                    response_text, procurement_result, logistics_result, order
+                )
+            else:
+                consolidation = self._section(decision, 'consolidation')
+            consolidation_result = self.consolidation_agent.build_result(consolidation, response_text)
+        except Exception as e:
+            logger.error("[%s] Error: %s", self.name, e)
+            procurement_result = self.procurement_agent.error_result(e)
+            logistics_result = self.logistics_agent.error_result(e, order, now)
+            consolidation_result = self.consolidation_agent.error_result(e)
+        
+        return {
+            'procurement': procurement_result,
+            'logistics': logistics_result,
+            'consolidation': consolidation_result
+        }
+    
+    @staticmethod
+    def _section(decision: Dict, key: str) -> Dict:
+        """Get one agent's section of the decision, or {} if it is missing or malformed"""
+        section = decision.get(key)
+        return section if isinstance(section, dict) else {}
+
+
 class LLMManagerAgent:
     """Manager Agent using LangGraph to orchestrate all agents"""
     
-    def __init__(self, api_key: str, inventory_manager: InventoryManager):
-        self.llm = ChatOpenAI(api_key=api_key, model="gpt-3.5-turbo", temperature=0.3)
+    def __init__(self, api_key: str, inventory_manager: InventoryManager, single_prompt: bool = False):
+        import httpx
+        from langchain_openai import ChatOpenAI
+        
+        # One pooled async client for every agent call, so TCP/TLS sessions
+        # are reused across calls; HTTP/2 is used when h2 is installed
+        self._http_client = httpx.AsyncClient(
+            http2=_HTTP2_AVAILABLE,
+            limits=httpx.Limits(max_keepalive_connections=20)
+        )
+        
+        # JSON mode makes every agent reply a bare JSON object, so parsing
+        # takes the json.loads fast path and no prose is generated
+        self.llm = ChatOpenAI(
+            api_key=api_key,
+            model="gpt-3.5-turbo",
+            temperature=0.3,
+            model_kwargs={"response_format": {"type": "json_object"}},
+            # The OpenAI client sends its own per-request timeout, which
+            # overrides the httpx client default, so it must be set here
+            timeout=_LLM_REQUEST_TIMEOUT,
+            http_async_client=self._http_client
+        )
         self.inventory_manager = inventory_manager
-        self.procurement_agent = LLMProcurementAgent(self.llm, inventory_manager)
-        self.logistics_agent = LLMLogisticsAgent(self.llm)
-        self.consolidation_agent = LLMConsolidationAgent(self.llm)
+        self.response_cache = ResponseCache()
+        self.procurement_agent = LLMProcurementAgent(self.llm, inventory_manager, self.response_cache)
+        self.logistics_agent = LLMLogisticsAgent(self.llm, self.response_cache)
+        self.consolidation_agent = LLMConsolidationAgent(self.llm, self.response_cache)
+        self.decision_agent = LLMOrderDecisionAgent(
+            self.llm,
+            self.procurement_agent,
+            self.logistics_agent,
+            self.consolidation_agent,
+            self.response_cache
+        )
+        # When set, one consolidated LLM call replaces the three agent calls
+        self.single_prompt = single_prompt
         self.name = "Manager Agent"
         
         # Initialize LangGraph
         self.graph = self._build_graph()
+        
+        # Run every graph on one long-lived event loop so the async LLM
+        # client's connection pool stays valid across orders and threads
+        self._loop = asyncio.new_event_loop()
+        self._loop_thread = threading.Thread(target=self._loop.run_forever, name="llm-manager-loop", daemon=True)
+        self._loop_thread.start()
+        self._closed = False
+        atexit.register(self.close)
+    
+    def close(self):
+        """Close the shared HTTP client and stop the event loop"""
+        if self._closed:
+            return
+        # Mark closed first so later calls fail fast instead of queueing on
+        # a loop that is about to stop
+        self._closed = True
+        
+        if not self._http_client.is_closed:
+            future = asyncio.run_coroutine_threadsafe(self._http_client.aclose(), self._loop)
+            try:
+                future.result(timeout=5)
+            except Exception as e:
+                future.cancel()
+                logger.warning("[%s] HTTP client did not close cleanly: %r", self.name, e)
+        
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._loop_thread.join(timeout=5)
+        # Closing a loop with unfinished tasks would destroy them mid-flight
+        if not self._loop_thread.is_alive() and not asyncio.all_tasks(self._loop):
+            self._loop.close()
+    
+    def _check_open(self):
+        """Raise if close() has already shut the manager down"""
+        if self._closed:
+            raise RuntimeError(f"{self.name} is closed")
     
     def _build_graph(self):
         """Build the LangGraph workflow"""
+        from langgraph.graph import StateGraph, START, END
+        
         workflow = StateGraph(LLMAgentState)
         
+        workflow.add_node("consensus", self._consensus_node)
+        workflow.add_edge("consensus", END)
+        
+        if self.single_prompt:
+            # One LLM call produces all three analyses
+            workflow.add_node("decision", self._decision_node)
+            workflow.add_edge(START, "decision")
+            workflow.add_edge("decision", "consensus")
+            return workflow.compile()
+        
         # Add nodes for each agent
         workflow.add_node("procurement", self._procurement_node)
         workflow.add_node("logistics", self._logistics_node)
         workflow.add_node("consolidation", self._consolidation_node)
-        workflow.add_node("consensus", self._consensus_node)
         
-        # Define edges
-        workflow.set_entry_point("procurement")
-        workflow.add_edge("procurement", "logistics")
-        workflow.add_edge("logistics", "consolidation")
+        # Define edges: procurement and logistics are independent, so they
+        # fan out from START and run concurrently; consolidation joins both
+        workflow.add_edge(START, "procurement")
+        workflow.add_edge(START, "logistics")
+        workflow.add_edge(["procurement", "logistics"], "consolidation")
         workflow.add_edge("consolidation", "consensus")
-        workflow.add_edge("consensus", END)
         
         return workflow.compile()
     
-    def _procurement_node(self, state: LLMAgentState) -> LLMAgentState:
+    async def _procurement_node(self, state: LLMAgentState) -> Dict:
         """Procurement Agent node"""
         logger.info("[STEP 1] Procurement Agent Evaluation")
         
-        result = self.procurement_agent.invoke(
+        result = await self.procurement_agent.ainvoke(
             state['order'],
             state['inventory'],
             state['materials']
         )
         
-        state['procurement_analysis'] = json.dumps(result)
-        state['messages'].append(AIMessage(content=f"Procurement: {result['reasoning']}"))
+        logger.info("  Result: %s", result['reasoning'])
+        logger.info("  Confidence: %.0f%%", result['confidence'] * 100)
         
-        logger.info(f"  Result: {result['reasoning']}")
-        logger.info(f"  Confidence: {result['confidence']*100:.0f}%")
-        
-        return state
+        # Return only the keys this node owns so parallel branches can merge
+        return {
+            'procurement_analysis': result,
+            'messages': [AIMessage(content=f"Procurement: {result['reasoning']}")]
+        }
     
-    def _logistics_node(self, state: LLMAgentState) -> LLMAgentState:
+    async def _logistics_node(self, state: LLMAgentState) -> Dict:
         """Logistics Agent node"""
         logger.info("[STEP 2] Logistics Agent Evaluation")
         
-        # Get material cost from procurement
-        procurement_data = json.loads(state['procurement_analysis'])
+        # Runs alongside procurement, so material cost is not known yet
         material_cost = 100000  # Default estimate
         
-        result = self.logistics_agent.invoke(state['order'], material_cost)
+        result = await self.logistics_agent.ainvoke(state['order'], material_cost, state.get('now'))
         
-        state['logistics_analysis'] = json.dumps(result)
-        state['messages'].append(AIMessage(content=f"Logistics: {result['reasoning']}"))
+        logger.info("  Result: %s", result['reasoning'])
+        logger.info("  Delivery Date: %s", result['delivery_date'])
+        logger.info("  Confidence: %.0f%%", result['confidence'] * 100)
         
-        logger.info(f"  Result: {result['reasoning']}")
-        logger.info(f"  Delivery Date: {result['delivery_date']}")
-        logger.info(f"  Confidence: {result['confidence']*100:.0f}%")
-        
-        return state
+        return {
+            'logistics_analysis': result,
+            'messages': [AIMessage(content=f"Logistics: {result['reasoning']}")]
+        }
     
-    def _consolidation_node(self, state: LLMAgentState) -> LLMAgentState:
+    async def _consolidation_node(self, state: LLMAgentState) -> Dict:
         """Consolidation Agent node"""
         logger.info("[STEP 3] Consolidation Agent Evaluation")
         
-        procurement_data = json.loads(state['procurement_analysis'])
-        logistics_data = json.loads(state['logistics_analysis'])
+        procurement_data = state['procurement_analysis']
+        logistics_data = state['logistics_analysis']
         
-        result = self.consolidation_agent.invoke(
-            procurement_data,
-            logistics_data,
-            state['order']
-        )
+        # Consensus needs every agent to proceed, so once procurement or
+        # logistics has rejected the order there is no deal to price
+        if not procurement_data.get('can_proceed', False):
+            result = self.consolidation_agent.blocked_result("procurement cannot proceed")
+        elif not logistics_data.get('can_proceed', False):
+            result = self.consolidation_agent.blocked_result("logistics cannot proceed")
+        else:
+            result = await self.consolidation_agent.ainvoke(
+                procurement_data,
+                logistics_data,
+                state['order']
+            )
         
-        state['consolidation_analysis'] = json.dumps(result)
-        state['messages'].append(AIMessage(content=f"Consolidation: {result['reasoning']}"))
+        logger.info("  Result: %s", result['reasoning'])
+        logger.info("  Confidence: %.0f%%", result['confidence'] * 100)
         
-        logger.info(f"  Result: {result['reasoning']}")
-        logger.info(f"  Confidence: {result['confidence']*100:.0f}%")
+        return {
+            'consolidation_analysis': result,
+            'messages': [AIMessage(content=f"Consolidation: {result['reasoning']}")]
+        }
+    
+    async def _decision_node(self, state: LLMAgentState) -> Dict:
+        """Single-call Order Decision Agent node"""
+        logger.info("[STEP 1-3] Order Decision Agent Evaluation")
+        
+        results = await self.decision_agent.ainvoke(state['order'], state.get('now'))
+        
+        for result in results.values():
+            logger.info("  %s: %s", result['agent'], result['reasoning'])
+            logger.info("  Confidence: %.0f%%", result['confidence'] * 100)
         
-        return state
+        return {
+            'procurement_analysis': results['procurement'],
+            'logistics_analysis': results['logistics'],
+            'consolidation_analysis': results['consolidation'],
+            'messages': [
+                AIMessage(content=f"Procurement: {results['procurement']['reasoning']}"),
+                AIMessage(content=f"Logistics: {results['logistics']['reasoning']}"),
+                AIMessage(content=f"Consolidation: {results['consolidation']['reasoning']}")
+            ]
+        }
     
-    def _consensus_node(self, state: LLMAgentState) -> LLMAgentState:
+    def _consensus_node(self, state: LLMAgentState) -> Dict:
         """Check consensus among all agents"""
         logger.info("[STEP 4] Consensus Check")
         
-        procurement_data = json.loads(state['procurement_analysis'])
-        logistics_data = json.loads(state['logistics_analysis'])
-        consolidation_data = json.loads(state['consolidation_analysis'])
+        procurement_data = state['procurement_analysis']
+        logistics_data = state['logistics_analysis']
+        consolidation_data = state['consolidation_analysis']
         
         # Check consensus
         all_can_proceed = (
@@ -517,35 +935,41 @@ class LLMManagerAgent:
         
         consensus_reached = all_can_proceed and avg_confidence > 0.75
         
-        logger.info(f"  All Agents Can Proceed: {all_can_proceed}")
-        logger.info(f"  Average Confidence: {avg_confidence*100:.0f}%")
-        logger.info(f"  Consensus Reached: {consensus_reached}")
-        
-        state['all_can_proceed'] = consensus_reached
+        logger.info("  All Agents Can Proceed: %s", all_can_proceed)
+        logger.info("  Average Confidence: %.0f%%", avg_confidence * 100)
+        logger.info("  Consensus Reached: %s", consensus_reached)
         
-        if consensus_reached:
-            state['final_decision'] = "SUCCESS"
-        else:
-            state['final_decision'] = "FAILURE"
-        
-        return state
+        return {
+            'all_can_proceed': consensus_reached,
+            'final_decision': "SUCCESS" if consensus_reached else "FAILURE"
+        }
     
     def process_order(self, request: OrderRequest) -> Dict:
         """Process order through LangGraph workflow"""
-        logger.info(f"\n{'='*60}")
-        logger.info(f"[{self.name}] Processing Order: {request.order_id}")
-        logger.info(f"[{self.name}] Request: {request.product_sku} x{request.quantity} to {request.customer_location}")
-        logger.info(f"{'='*60}\n")
+        self._check_open()
+        future = asyncio.run_coroutine_threadsafe(self.aprocess_order(request), self._loop)
+        return future.result()
+    
+    def process_orders(self, requests: List[OrderRequest]) -> List[Dict]:
+        """Process a batch of orders concurrently, returning responses in request order"""
+        self._check_open()
+        future = asyncio.run_coroutine_threadsafe(self.aprocess_orders(requests), self._loop)
+        return future.result()
+    
+    async def aprocess_orders(self, requests: List[OrderRequest]) -> List[Dict]:
+        """Process a batch of orders concurrently on the current event loop"""
+        return list(await asyncio.gather(*(self.aprocess_order(request) for request in requests)))
+    
+    async def aprocess_order(self, request: OrderRequest) -> Dict:
+        """Process order through LangGraph workflow on the current event loop"""
+        logger.info("\n%s", _LOG_RULE)
+        logger.info("[%s] Processing Order: %s", self.name, request.order_id)
+        logger.info("[%s] Request: %s x%s to %s", self.name, request.product_sku, request.quantity, request.customer_location)
+        logger.info("%s\n", _LOG_RULE)
         
         # Prepare initial state
         initial_state: LLMAgentState = {
-            'order': {
-                'order_id': request.order_id,
-                'product_sku': request.product_sku,
-                'quantity': request.quantity,
-                'customer_location': request.customer_location,
-                'priority': request.priority
-            },
+            'order': request.to_dict(),
             'inventory': self.inventory_manager.inventory,
             'materials': self.inventory_manager.materials,
             'procurement_analysis': None,
@@ -553,25 +977,27 @@ class LLMManagerAgent:
             'consolidation_analysis': None,
             'messages': [HumanMessage(content=f"Process order: {request.order_id}")],
             'all_can_proceed': False,
-            'final_decision': None
+            'final_decision': None,
+            # One clock read per order, shared by every date computed for it
+            'now': datetime.now()
         }
         
         # Run the graph
-        final_state = self.graph.invoke(initial_state)
+        final_state = await self.graph.ainvoke(initial_state)
         
         # Generate final response
         return self._generate_final_response(request, final_state)
     
     def _generate_final_response(self, request: OrderRequest, state: LLMAgentState) -> Dict:
         """Generate final API response"""
-        consolidation_data = json.loads(state['consolidation_analysis'])
+        consolidation_data = state['consolidation_analysis']
         
         if not state['all_can_proceed']:
             return {
                 'status': 'FAILURE',
                 'order_id': request.order_id,
                 'message': 'Order cannot be processed. Consensus not reached.',
-                'timestamp': datetime.now().isoformat()
+                'timestamp': state['now'].isoformat()
             }
         
         response = {
@@ -582,31 +1008,37 @@ class LLMManagerAgent:
             'customer_location': request.customer_location,
             'final_price': consolidation_data.get('final_price', 0),
             'total_deal_value': consolidation_data.get('total_deal_value', 0),
-            'delivery_date': json.loads(state['logistics_analysis']).get('delivery_date', ''),
+            'delivery_date': state['logistics_analysis'].get('delivery_date', ''),
             'cost_breakdown': {
                 'discount_rate': consolidation_data.get('discount_rate', 0),
                 'profit_margin': 0.25
             },
             'consensus_reached': state['all_can_proceed'],
             'agent_responses': {
-                'procurement': json.loads(state['procurement_analysis']),
-                'logistics': json.loads(state['logistics_analysis']),
+                'procurement': state['procurement_analysis'],
+                'logistics': state['logistics_analysis'],
                 'consolidation': consolidation_data
             },
-            'timestamp': datetime.now().isoformat()
+            'timestamp': state['now'].isoformat()
         }
         
-        logger.info(f"\n{'='*60}")
-        logger.info("FINAL RESPONSE:")
-        logger.info(f"{'='*60}")
-        logger.info(json.dumps(response, indent=2))
-        logger.info(f"{'='*60}\n")
+        # Pretty-printing the response is costly, so skip it when INFO is off
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("\n%s", _LOG_RULE)
+            logger.info("FINAL RESPONSE:")
+            logger.info("%s", _LOG_RULE)
+            logger.info("%s", orjson.dumps(response, option=orjson.OPT_INDENT_2).decode())
+            logger.info("%s\n", _LOG_RULE)
         
         return response
 
 
 def main():
     """Main entry point for LangGraph-based system"""
+    from dotenv import load_dotenv
+    
+    # Load environment variables
+    load_dotenv()
     
     # Load API key
     api_key = os.getenv('OPEN_AI_API_KEY')
@@ -622,10 +1054,7 @@ def main():
     
     manager = LLMManagerAgent(api_key, inventory_manager)
     
-    # Test Case 1
-    print("\n" + "="*80)
-    print("TEST CASE 1: Standard Order - LangGraph + OpenAI")
-    print("="*80)
+    # Test Case 1: Standard Order
     request1 = OrderRequest(
         order_id="ORD-001",
         product_sku="PMP-STD-100",
@@ -633,12 +1062,8 @@ def main():
         customer_location="local city",
         priority="normal"
     )
-    response1 = manager.process_order(request1)
     
-    # Test Case 2
-    print("\n" + "="*80)
-    print("TEST CASE 2: Large Order - LangGraph + OpenAI")
-    print("="*80)
+    # Test Case 2: Large Order
     request2 = OrderRequest(
         order_id="ORD-002",
         product_sku="PMP-HEAVY-200",
@@ -646,7 +1071,15 @@ def main():
         customer_location="national",
         priority="expedited"
     )
-    response2 = manager.process_order(request2)
+    
+    # Independent orders are processed as one concurrent batch
+    print("\n" + "="*80)
+    print("TEST CASES 1-2: Standard + Large Order - LangGraph + OpenAI (batched)")
+    print("="*80)
+    responses = manager.process_orders([request1, request2])
+    
+    for request, response in zip([request1, request2], responses):
+        print(f"{request.order_id}: {response['status']}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,103 @@
+"""
+Unit tests for the LangGraph agents, using a canned LLM instead of OpenAI
+Run with: python -m unittest test_langgraph_agents
+"""
+
+import asyncio
+import json
+import os
+import unittest
+
+from langchain_core.messages import AIMessage
+
+from langgraph_agents import (
+    InventoryManager, LLMProcurementAgent, LLMLogisticsAgent,
+    LLMConsolidationAgent, LLMOrderDecisionAgent
+)
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+
+
+class CannedLLM:
+    """Stand-in chat model that always answers with the same text"""
+    
+    def __init__(self, reply: str):
+        self.reply = reply
+    
+    async def ainvoke(self, messages, **kwargs):
+        return AIMessage(content=self.reply)
+
+
+class OrderDecisionAgentTest(unittest.TestCase):
+    """LLMOrderDecisionAgent splitting one reply into per-agent results"""
+    
+    def setUp(self):
+        self.inventory_manager = InventoryManager(
+            os.path.join(DATA_DIR, 'inventory.json'),
+            os.path.join(DATA_DIR, 'materials.json')
+        )
+        self.order = {
+            'order_id': 'ORD-TEST',
+            'product_sku': 'PMP-STD-100',
+            'quantity': 5000,
+            'customer_location': 'local city',
+            'priority': 'normal'
+        }
+    
+    def _decide(self, reply: str) -> dict:
+        llm = CannedLLM(reply)
+        agent = LLMOrderDecisionAgent(
+            llm,
+            LLMProcurementAgent(llm, self.inventory_manager),
+            LLMLogisticsAgent(llm),
+            LLMConsolidationAgent(llm)
+        )
+        return asyncio.run(agent.ainvoke(self.order))
+    
+    def test_reply_without_sections_does_not_proceed(self):
+        reply = json.dumps({
+            'can_proceed': False,
+            'reasoning': 'Materials are not available; insufficient stock',
+            'confidence': 0.95
+        })
+        
+        results = self._decide(reply)
+        
+        self.assertFalse(results['procurement']['can_proceed'])
+        self.assertFalse(results['consolidation']['can_proceed'])
+        self.assertEqual(results['consolidation']['final_price'], 0)
+    
+    def test_malformed_section_does_not_proceed(self):
+        reply = json.dumps({
+            'procurement': 'available',
+            'logistics': {'location_type': 'local', 'reasoning': 'Near', 'confidence': 0.9},
+            'consolidation': {'can_proceed': True, 'final_price': 10, 'confidence': 0.9}
+        })
+        
+        results = self._decide(reply)
+        
+        self.assertFalse(results['procurement']['can_proceed'])
+        self.assertTrue(results['consolidation']['can_proceed'])
+    
+    def test_well_formed_reply_is_used_as_is(self):
+        reply = json.dumps({
+            'procurement': {'can_proceed': True, 'reasoning': 'In stock', 'confidence': 0.9},
+            'logistics': {'location_type': 'local', 'delivery_date': '2030-01-01', 'reasoning': 'Near', 'confidence': 0.9},
+            'consolidation': {'can_proceed': True, 'final_price': 10, 'total_deal_value': 50, 'reasoning': 'Ok', 'confidence': 0.9}
+        })
+        
+        results = self._decide(reply)
+        
+        self.assertTrue(results['procurement']['can_proceed'])
+        self.assertEqual(results['logistics']['delivery_date'], '2030-01-01')
+        self.assertEqual(results['consolidation']['total_deal_value'], 50.0)
+    
+    def test_non_json_reply_uses_text_heuristics(self):
+        results = self._decide("All materials are available, we can proceed")
+        
+        self.assertTrue(results['procurement']['can_proceed'])
+        self.assertEqual(results['procurement']['confidence'], 0.85)
+
+
+if __name__ == '__main__':
+    unittest.main()